@@ -0,0 +1,15 @@
+import logging
+
+_configured = False
+
+
+def setup(level: int = logging.INFO) -> None:
+    """Configure client logging once per process, no matter how many scripts import it."""
+    global _configured
+    if _configured:
+        return
+    logging.basicConfig(level=level)
+
+    # Suppress the specific cleanup error from openai.agents
+    logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
+    _configured = True
@@ -0,0 +1,123 @@
+import asyncio
+import functools
+from contextlib import AsyncExitStack
+from typing import Any, Coroutine, Dict, Optional, Tuple
+from agents.mcp import MCPServerStreamableHttp, MCPServerStreamableHttpParams, MCPServer # type: ignore
+
+# Define the MCP server endpoint URL
+SERVER_MCP_ENDPOINT_URL = "http://localhost:8000/mcp/"
+
+# Name the shared MCP client reports to the server
+CLIENT_NAME = "EduClient"
+
+# Process-wide MCP client shared by every client script, ref-counted across callers
+_client: Optional[MCPServerStreamableHttp] = None
+_client_users = 0
+_client_lock = asyncio.Lock()
+_client_release: Optional[asyncio.Event] = None
+_client_owner: Optional[asyncio.Task] = None
+
+# MCP JSON-RPC method -> (server capability that gates it, bound ClientSession method)
+HANDLERS = {
+    "resources/templates/list": ("resources", "list_resource_templates"),
+    "resources/list": ("resources", "list_resources"),
+    "resources/read": ("resources", "read_resource"),
+    "tools/list": ("tools", "list_tools"),
+}
+
+
+def supported_handlers(capabilities: Any) -> Dict[str, str]:
+    """Map each MCP method the server advertises to the session method that calls it."""
+    return {
+        rpc_method: attr_name
+        for rpc_method, (capability, attr_name) in HANDLERS.items()
+        if getattr(capabilities, capability, None) is not None
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def build_uri_variations(resource_uri: str) -> Tuple[str, ...]:
+    """Build the alternative URI spellings to try when reading a resource."""
+    parts = resource_uri.split("://", 1)
+    path = parts[-1]
+    if len(parts) == 1 or parts[0] != "students":
+        # Only the students:// scheme has known aliases
+        variations = (resource_uri, f"resource://{path}")
+    else:
+        variations = (
+            resource_uri,
+            f"student://{path}",
+            f"resource://students/{path}",
+            f"data://students/{path}",
+            path,  # Just the path
+            f"resource://{path}",
+        )
+    # Drop duplicates (e.g. a resource:// input) while keeping order; each one is a wasted read
+    return tuple(dict.fromkeys(variations))
+
+
+async def _own_client(connected: "asyncio.Future[MCPServerStreamableHttp]", release: asyncio.Event) -> None:
+    """Keep the shared client connected until its last user releases it.
+
+    Connecting and disconnecting both happen in this one task, as the transport's
+    anyio task group requires, so no caller's stack ever owns the connection.
+    """
+    # No JSON decoder hook is exposed here: the streamable-HTTP transport already
+    # decodes responses with JSONRPCMessage.model_validate_json (pydantic-core, Rust)
+    mcp_params = MCPServerStreamableHttpParams(url=SERVER_MCP_ENDPOINT_URL)
+    try:
+        # The tool set is static for a session, so let the SDK memoize list_tools();
+        # agents listing tools at init then reuse the first result
+        async with MCPServerStreamableHttp(params=mcp_params, name=CLIENT_NAME, cache_tools_list=True) as client:
+            connected.set_result(client)
+            await release.wait()
+    except Exception as e:
+        if connected.done():
+            raise
+        connected.set_exception(e)
+
+
+async def _release_client() -> None:
+    """Drop one reference to the shared client, disconnecting it after the last one."""
+    global _client, _client_users
+    async with _client_lock:
+        _client_users -= 1
+        if _client_users:
+            return
+        _client = None
+        _client_release.set()
+        await _client_owner
+
+
+async def get_mcp_client(stack: AsyncExitStack) -> MCPServer:
+    """Return the shared MCP client, connecting it on first use.
+
+    The caller holds a reference until its exit stack closes; the connection stays
+    open while any caller still holds one.
+    """
+    global _client, _client_users, _client_release, _client_owner
+    async with _client_lock:
+        if _client is None:
+            connected = asyncio.get_running_loop().create_future()
+            _client_release = asyncio.Event()
+            _client_owner = asyncio.create_task(_own_client(connected, _client_release))
+            _client = await connected
+        _client_users += 1
+    stack.push_async_callback(_release_client)
+    return _client
+
+
+async def _with_eager_tasks(main: Coroutine[Any, Any, Any]) -> Any:
+    """Install the eager task factory on the running loop, then run the coroutine."""
+    # Tasks that finish without suspending skip a trip through the event loop
+    asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    return await main
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run the client coroutine on uvloop when it is installed, otherwise on the default loop."""
+    try:
+        import uvloop # type: ignore
+    except ImportError:
+        return asyncio.run(_with_eager_tasks(main))
+    return uvloop.run(_with_eager_tasks(main))
@@ -1,202 +1,214 @@
 import asyncio
 import logging
+from contextlib import AsyncExitStack
 from agents import Agent, ModelSettings, Runner, set_tracing_disabled # type: ignore
-from agents.mcp import MCPServerStreamableHttp, MCPServerStreamableHttpParams, MCPServer # type: ignore
+from agents.mcp import MCPServer # type: ignore
 
 from llm_setup import model1, model_settings
+from _logging import setup
+from _shared import SERVER_MCP_ENDPOINT_URL, build_uri_variations, get_mcp_client, run, supported_handlers
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup()
 logger = logging.getLogger(__name__)
-
-# Suppress the specific cleanup error from openai.agents
-logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
-
-# Define the MCP server endpoint URL
-SERVER_MCP_ENDPOINT_URL = "http://localhost:8000/mcp/" 
     
 set_tracing_disabled(True)
 
-async def test_resource_templates_approach_1(mcp_server_client):
+# Upper bound, in seconds, on racing the resource template approaches
+APPROACH_TIMEOUT = 10.0
+
+# MCP methods each session approach dispatches to; the fallback only runs once the template approaches fail
+TEMPLATE_RPC_METHODS = ("resources/templates/list",)
+FALLBACK_RPC_METHODS = ("resources/list",)
+
+async def test_resource_templates_approach_1(mcp_server_client, handlers):
     """Approach 1: Direct server client methods (if available)"""
     logger.info("\n=== Approach 1: Direct Server Client Methods ===")
     
-    # Check if the server client itself has resource methods
-    direct_methods = [
-        'list_resource_templates',
-        'list_resources', 
-        'get_resource_templates',
-        'resources'
-    ]
+    # Dispatch straight to the method backing the advertised templates capability
+    method_name = handlers.get("resources/templates/list")
+    method = getattr(mcp_server_client, method_name, None) if method_name else None
+    if method is not None and callable(method):
+        try:
+            result = await method()
+            logger.info("✓ Direct %s() successful", method_name)
+            return result
+        except Exception as e:
+            logger.info("✗ Direct %s() failed: %s", method_name, e)
     
-    for method_name in direct_methods:
-        if hasattr(mcp_server_client, method_name):
+    logger.info("No direct server client resource methods available")
+    return None
+
+async def try_session_methods(session, method_names, label):
+    """Call the named session methods in order and return the first successful result."""
+    logger.info("\n=== %s ===", label)
+    
+    # dict.fromkeys drops repeated names while keeping their order
+    for method_name in dict.fromkeys(method_names):
+        method = getattr(session, method_name, None) if method_name else None
+        if method is not None and callable(method):
             try:
-                method = getattr(mcp_server_client, method_name)
-                if callable(method):
-                    result = await method()
-                    logger.info(f"✓ Direct {method_name}() successful")
-                    return result
+                result = await method()
+                logger.info("✓ Session %s() successful", method_name)
+                return result
             except Exception as e:
-                logger.info(f"✗ Direct {method_name}() failed: {e}")
+                logger.info("✗ Session %s() failed: %s", method_name, e)
     
-    logger.info("No direct server client resource methods available")
+    logger.info("No session methods available for: %s", label)
     return None
 
-async def test_resource_templates_approach_2(mcp_server_client):
-    """Approach 2: Session-based methods with proper context management"""
-    logger.info("\n=== Approach 2: Session-Based Methods ===")
-    
+async def _read_uri(session, uri):
+    """Read a single URI variation, tagging the result with the URI that produced it."""
     try:
-        # Create a new session context
-        async with mcp_server_client.session as session:
-            logger.info(f"Session established: {type(session)}")
-            
-            # Try multiple session methods
-            session_methods = [
-                'list_resource_templates',
-                'list_resources',
-                'get_resource_templates',
-                'resource_templates'
-            ]
-            
-            for method_name in session_methods:
-                if hasattr(session, method_name):
-                    try:
-                        method = getattr(session, method_name)
-                        if callable(method):
-                            result = await method()
-                            logger.info(f"✓ Session {method_name}() successful")
-                            return result
-                    except Exception as e:
-                        logger.info(f"✗ Session {method_name}() failed: {e}")
-            
-            logger.info("No session resource template methods available")
-            return None
-            
+        return uri, await session.read_resource(uri)
     except Exception as e:
-        logger.error(f"Session context error: {e}")
-        return None
+        logger.debug("URI %s failed: %s", uri, e)
+        raise
 
-async def test_resource_templates_approach_3(mcp_server_client):
-    """Approach 3: Initialize session and call MCP protocol methods"""
-    logger.info("\n=== Approach 3: MCP Protocol Methods ===")
-    
-    try:
-        async with mcp_server_client.session as session:
-            # Try to call initialize if available
-            if hasattr(session, 'initialize'):
-                try:
-                    init_result = await session.initialize()
-                    logger.info(f"Session initialized: {init_result}")
-                except Exception as e:
-                    logger.info(f"Session initialization failed: {e}")
-            
-            # Try MCP protocol methods
-            mcp_methods = [
-                'list_resource_templates_mcp',
-                'list_resources_mcp',
-                'call_mcp',
-                'send_request'
-            ]
-            
-            for method_name in mcp_methods:
-                if hasattr(session, method_name):
-                    try:
-                        method = getattr(session, method_name)
-                        if callable(method):
-                            if 'mcp' in method_name:
-                                result = await method()
-                            else:
-                                # For call_mcp or send_request, we might need parameters
-                                continue
-                            logger.info(f"✓ MCP {method_name}() successful")
-                            return result
-                    except Exception as e:
-                        logger.info(f"✗ MCP {method_name}() failed: {e}")
-            
-            logger.info("No MCP protocol methods available")
-            return None
-            
-    except Exception as e:
-        logger.error(f"MCP protocol error: {e}")
-        return None
+def _rejects_scheme(error):
+    """Check whether a read failed because the server rejected the URI scheme itself."""
+    message = str(error).lower()
+    return "scheme" in message or "unknown uri" in message
 
-async def test_read_resource_robust(mcp_server_client, resource_uri):
+def _resource_text(content):
+    """Extract the payload from a read_resource result."""
+    # Handle different response formats
+    if hasattr(content, 'contents') and content.contents:
+        return content.contents[0].text
+    elif hasattr(content, 'content'):
+        return content.content
+    elif hasattr(content, 'text'):
+        return content.text
+    else:
+        return str(content)
+
+async def test_read_resource_robust(session, resource_uri):
     """Robust resource reading with multiple URI formats and error handling"""
-    logger.info(f"\n=== Reading Resource: {resource_uri} ===")
+    logger.info("\n=== Reading Resource: %s ===", resource_uri)
     
     # Multiple URI format variations to try
-    uri_variations = [
-        resource_uri,
-        resource_uri.replace("students://", "student://"),
-        resource_uri.replace("students://", "resource://students/"),
-        resource_uri.replace("students://", "data://students/"),
-        resource_uri.replace("students://", ""),  # Just the path
-        f"resource://{resource_uri.split('://', 1)[1]}" if "://" in resource_uri else f"resource://{resource_uri}"
-    ]
+    primary, *alternatives = build_uri_variations(resource_uri)
+    
+    if getattr(session, 'read_resource', None) is None:
+        logger.warning("read_resource method not available on session")
+        return None
     
-    for uri in uri_variations:
+    # The URI as given normally works, so only probe the alternatives once it has failed
+    failed_schemes = set()
+    try:
+        _, content = await _read_uri(session, primary)
+    except Exception as e:
+        if _rejects_scheme(e):
+            failed_schemes.add(primary.split("://", 1)[0])
+    else:
+        logger.info("✓ Successfully read resource with URI: %s", primary)
+        return _resource_text(content)
+    
+    # Probe the remaining variations concurrently and keep the first one that succeeds
+    schemes = {}
+    for uri in alternatives:
+        scheme = uri.split("://", 1)[0]
+        if scheme not in failed_schemes:
+            schemes[asyncio.create_task(_read_uri(session, uri))] = scheme
+    pending = set(schemes)
+    winner = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # Retrieve every exception in the batch, even once a winner is chosen
+                error = task.exception()
+                if error is not None:
+                    # The server rejected the scheme itself; siblings using it will fail too
+                    if _rejects_scheme(error):
+                        failed_schemes.add(schemes[task])
+                elif winner is None:
+                    winner = task.result()
+            
+            for task in [t for t in pending if schemes[t] in failed_schemes]:
+                task.cancel()
+                pending.discard(task)
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    if winner is None:
+        logger.warning("All URI variations failed for: %s", resource_uri)
+        return None
+    
+    uri, content = winner
+    logger.info("✓ Successfully read resource with URI: %s", uri)
+    return _resource_text(content)
+
+def _has_templates(result):
+    """Check whether an approach result actually carries resource templates."""
+    if isinstance(result, list):
+        return bool(result)
+    return bool(getattr(result, 'resourceTemplates', None) or getattr(result, 'resource_templates', None))
+
+async def _first_with_templates(tasks):
+    """Return the first task result in completion order that carries templates, or None."""
+    for next_done in asyncio.as_completed(tasks):
         try:
-            async with mcp_server_client.session as session:
-                if hasattr(session, 'read_resource'):
-                    try:
-                        content = await session.read_resource(uri)
-                        logger.info(f"✓ Successfully read resource with URI: {uri}")
-                        
-                        # Handle different response formats
-                        if hasattr(content, 'contents') and content.contents:
-                            return content.contents[0].text
-                        elif hasattr(content, 'content'):
-                            return content.content
-                        elif hasattr(content, 'text'):
-                            return content.text
-                        else:
-                            return str(content)
-                            
-                    except Exception as e:
-                        logger.debug(f"URI {uri} failed: {e}")
-                        continue
-                else:
-                    logger.warning("read_resource method not available on session")
-                    break
-                    
+            result = await next_done
         except Exception as e:
-            logger.debug(f"Session error for URI {uri}: {e}")
+            logger.info("✗ Approach failed: %s", e)
             continue
-    
-    logger.warning(f"All URI variations failed for: {resource_uri}")
+        if _has_templates(result):
+            return result
     return None
 
 async def run_alternative_client():
     """Run the alternative MCP client with multiple approaches."""
-    logger.info(f"Starting alternative MCP client for {SERVER_MCP_ENDPOINT_URL}...")
+    logger.info("Starting alternative MCP client for %s...", SERVER_MCP_ENDPOINT_URL)
     
     try:
-        mcp_params = MCPServerStreamableHttpParams(url=SERVER_MCP_ENDPOINT_URL)
-        
-        async with MCPServerStreamableHttp(params=mcp_params, name="AlternativeClient") as mcp_server_client:
-            logger.info(f"Connected to MCP server: {mcp_server_client.name}")
+        async with AsyncExitStack() as stack:
+            mcp_server_client = await get_mcp_client(stack)
+            
+            # connect() already entered the session; share it across every probe below
+            session = mcp_server_client.session
+            logger.info("Connected to MCP server: %s", mcp_server_client.name)
+            
+            # connect() already ran the initialize handshake; reuse its result instead of a second round-trip
+            init_result = mcp_server_client.server_initialize_result
+            capabilities = init_result.capabilities
+            handlers = supported_handlers(capabilities)
+            logger.info("Session initialized: %s", init_result)
             
             # Try different approaches to list resource templates
             resource_templates = None
             
-            # Approach 1: Direct server client methods
-            result = await test_resource_templates_approach_1(mcp_server_client)
-            if result:
-                resource_templates = result
-            
-            # Approach 2: Session-based methods
-            if not resource_templates:
-                result = await test_resource_templates_approach_2(mcp_server_client)
-                if result:
-                    resource_templates = result
+            if not capabilities.resources:
+                logger.info("Server does not advertise resources; skipping template approaches")
+            else:
+                # Race the two template approaches and keep the first one that returns templates
+                tasks = [
+                    asyncio.create_task(test_resource_templates_approach_1(mcp_server_client, handlers)),
+                    # Approach 2: templates list on the shared session
+                    asyncio.create_task(try_session_methods(
+                        session, [handlers.get(rpc) for rpc in TEMPLATE_RPC_METHODS], "Approach 2: Session-Based Methods"
+                    )),
+                ]
+                try:
+                    resource_templates = await asyncio.wait_for(_first_with_templates(tasks), timeout=APPROACH_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning("Resource template approaches timed out after %ss", APPROACH_TIMEOUT)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                
+                if not resource_templates:
+                    # Approach 3: fall back to the plain resources/list request
+                    resource_templates = await try_session_methods(
+                        session, [handlers.get(rpc) for rpc in FALLBACK_RPC_METHODS], "Approach 3: MCP Protocol Methods"
+                    )
             
-            # Approach 3: MCP protocol methods  
-            if not resource_templates:
-                result = await test_resource_templates_approach_3(mcp_server_client)
-                if result:
-                    resource_templates = result
+            # Test resource reading with robust approach; start it now so the read
+            # round-trip overlaps with the template logging below
+            student_id = "S123"
+            resource_uri = f"students://{student_id}/profile"
+            read_task = asyncio.create_task(test_read_resource_robust(session, resource_uri))
             
             # Process and display results
             if resource_templates:
@@ -213,40 +225,38 @@ async def run_alternative_client():
                 
                 if templates:
                     for template in templates:
-                        logger.info(f"\nResource Template: {getattr(template, 'name', 'Unknown')}")
-                        logger.info(f"URI Template: {getattr(template, 'uriTemplate', 'Unknown')}")
-                        logger.info(f"Description: {getattr(template, 'description', 'No description')}")
+                        logger.info("\nResource Template: %s", getattr(template, 'name', 'Unknown'))
+                        logger.info("URI Template: %s", getattr(template, 'uriTemplate', 'Unknown'))
+                        logger.info("Description: %s", getattr(template, 'description', 'No description'))
                         logger.info("-" * 30)
                 else:
-                    logger.info(f"Resource templates in unknown format: {resource_templates}")
+                    logger.info("Resource templates in unknown format: %s", resource_templates)
             else:
                 logger.warning("Failed to retrieve resource templates using any approach")
             
-            # Test resource reading with robust approach
-            student_id = "S123"
-            resource_uri = f"students://{student_id}/profile"
-            content = await test_read_resource_robust(mcp_server_client, resource_uri)
+            # Collect the profile read started above
+            content = await read_task
             
             if content:
-                logger.info(f"\n=== Student Profile Retrieved ===")
+                logger.info("\n=== Student Profile Retrieved ===")
                 print(f"Student Profile: {content}")
             else:
                 logger.warning("Failed to retrieve student profile")
                 
     except ConnectionRefusedError:
-        logger.error(f"Error: Connection refused. Ensure the MCP server is running at {SERVER_MCP_ENDPOINT_URL}")
+        logger.error("Error: Connection refused. Ensure the MCP server is running at %s", SERVER_MCP_ENDPOINT_URL)
     except Exception as e:
-        logger.error(f"An unexpected error occurred: {str(e)}", exc_info=True)
+        logger.error("An unexpected error occurred: %s", e, exc_info=True)
 
 def main():
     """Main entry point for the alternative client."""
     try:
-        asyncio.run(run_alternative_client())
+        run(run_alternative_client())
         logger.info("Alternative client completed successfully")
     except KeyboardInterrupt:
         logger.info("Alternative client interrupted by user")
     except Exception as e:
-        logger.error(f"Fatal error: {str(e)}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         exit(1)
 
 if __name__ == "__main__":
@@ -1,50 +1,77 @@
 import asyncio
+import functools
 import logging
+import sys
+from contextlib import AsyncExitStack
+from typing import Any, List, Sequence
 from agents import Agent, ModelSettings, Runner, set_tracing_disabled # type: ignore
-from agents.mcp import MCPServerStreamableHttp, MCPServerStreamableHttpParams, MCPServer # type: ignore
+from agents.mcp import MCPServer # type: ignore
 
-from llm_setup import model1, model_settings
+from llm_setup import http_client, model1, model_settings
+from _logging import setup
+from _shared import SERVER_MCP_ENDPOINT_URL, get_mcp_client, run
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup()
 logger = logging.getLogger(__name__)
-
-# Suppress the specific cleanup error from openai.agents
-logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
-
-# Define the MCP server endpoint URL
-SERVER_MCP_ENDPOINT_URL = "http://localhost:8000/mcp/" 
     
 set_tracing_disabled(True)
 
+# Upper bound on concurrent agent runs in run_batch; tune against the Gemini rate limits
+MAX_CONCURRENT_RUNS = 8
 
-async def run_agent_with_mcp(mcp_server_client: MCPServer):
-    """Run the agent with the given MCP server client."""
-    try:    
-        agent = Agent(
-            name="MyMCPConnectedAssistant",
-            instructions="You are a helpful assistant designed to test MCP connections.",
-            mcp_servers=[mcp_server_client],
-            model=model1,
-            # model_settings=model_settings,
-        )
-        
-        logger.info(f"Agent '{agent.name}' initialized with MCP server: '{mcp_server_client.name}'.")
+# Prompts sent by run_agent_with_mcp when no messages are given
+DEFAULT_MESSAGES = (
+    # "What is the current schedule for AI-101 section A?",
+    # "Give me the student's basic profile information of S123",
+    "give me current topic covered in AI-101",
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_agent(name: str, mcp_server_client: MCPServer) -> Agent:
+    """Build the agent once per (name, MCP server client) and reuse it across runs."""
+    return Agent(
+        name=name,
+        instructions="You are a helpful assistant designed to test MCP connections.",
+        mcp_servers=[mcp_server_client],
+        model=model1,
+        # model_settings=model_settings,
+    )
 
-        # message = "What is the current schedule for AI-101 section A?"
+
+async def run_agent_with_mcp(mcp_server_client: MCPServer, messages: Sequence[str] = DEFAULT_MESSAGES):
+    """Run the agent on each message, reusing one agent and one MCP connection for all of them."""
+    try:    
+        agent = _build_agent("MyMCPConnectedAssistant", mcp_server_client)
         
-        # message = "Give me the student's basic profile information of S123"
-    
-        message = "give me current topic covered in AI-101"
-        print(f"Running: {message}")
-        result = await Runner.run(starting_agent=agent, input=message)
-        print(result.final_output)
+        logger.info("Agent '%s' initialized with MCP server: '%s'.", agent.name, mcp_server_client.name)
+
+        for message in messages:
+            print(f"Running: {message}", flush=False)
+            result = await Runner.run(starting_agent=agent, input=message)
+            # Emit the whole response in one write instead of per-line flushes
+            sys.stdout.write(f"{result.final_output}\n")
+            sys.stdout.flush()
         
     except Exception as e:
-        logger.error(f"Error during agent execution: {str(e)}", exc_info=True)
+        logger.error("Error during agent execution: %s", e, exc_info=True)
         raise
 
 
+async def run_batch(mcp_server_client: MCPServer, prompts: Sequence[str], concurrency: int = MAX_CONCURRENT_RUNS) -> List[Any]:
+    """Run the agent on many prompts concurrently, keeping at most `concurrency` runs in flight."""
+    agent = _build_agent("MyMCPConnectedAssistant", mcp_server_client)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run_one(prompt: str) -> Any:
+        async with semaphore:
+            result = await Runner.run(starting_agent=agent, input=prompt)
+            return result.final_output
+
+    return await asyncio.gather(*(_run_one(prompt) for prompt in prompts))
+
+
 async def list_tools(mcp_server_client: MCPServer):
     """List available tools from the MCP server."""
     try:
@@ -54,49 +81,51 @@ async def list_tools(mcp_server_client: MCPServer):
         logger.info("\nAvailable Tools:")
         logger.info("=" * 50)
         for tool in tools:
-            logger.info(f"\nTool: {tool.name}")
-            logger.info(f"Description: {tool.description}")
+            logger.info("\nTool: %s", tool.name)
+            logger.info("Description: %s", tool.description)
             logger.info("-" * 30)
     except Exception as e:
-        logger.error(f"Error listing tools: {str(e)}")
+        logger.error("Error listing tools: %s", e)
 
 
 async def list_and_read_resources(mcp_server_client: MCPServer):
     """List resource templates and read a specific resource."""
     try:
-        async with mcp_server_client.session as session:
-            # List resource templates
-            logger.info("\n=== Listing Resource Templates ===")
-            resources = await session.list_resource_templates()
-            
-            logger.info("\nAvailable Resource Templates:")
-            logger.info("=" * 50)
-            for template in resources.resourceTemplates:
-                logger.info(f"\nResource: {template.name}")
-                logger.info(f"URI Template: {template.uriTemplate}")
-                logger.info(f"Description: {template.description}")
-                logger.info("-" * 30)
-            
-            # Read a specific resource
-            student_id = "S123"
-            logger.info(f"\n=== Getting Student Profile for {student_id} ===")
-            content = await session.read_resource(f"students://{student_id}/profile")
-            print(f"Student Profile: {content.contents[0].text}\n")
-            
+        # connect() already entered the session, and other callers may share it
+        session = mcp_server_client.session
+        # List resource templates
+        logger.info("\n=== Listing Resource Templates ===")
+        resources = await session.list_resource_templates()
+        
+        logger.info("\nAvailable Resource Templates:")
+        logger.info("=" * 50)
+        for template in resources.resourceTemplates:
+            logger.info("\nResource: %s", template.name)
+            logger.info("URI Template: %s", template.uriTemplate)
+            logger.info("Description: %s", template.description)
+            logger.info("-" * 30)
+        
+        # Read a specific resource
+        student_id = "S123"
+        logger.info("\n=== Getting Student Profile for %s ===", student_id)
+        content = await session.read_resource(f"students://{student_id}/profile")
+        print(f"Student Profile: {content.contents[0].text}\n")
+        
     except Exception as e:
-        logger.error(f"Error with resource operations: {str(e)}", exc_info=True)
+        logger.error("Error with resource operations: %s", e, exc_info=True)
         raise
 
 
 async def run_http_client():
     """Run the HTTP client to connect to the MCP server."""
-    logger.info(f"Starting MCP HTTP client to connect to {SERVER_MCP_ENDPOINT_URL}...")
+    logger.info("Starting MCP HTTP client to connect to %s...", SERVER_MCP_ENDPOINT_URL)
     
     try:
-        mcp_params = MCPServerStreamableHttpParams(url=SERVER_MCP_ENDPOINT_URL)
-        
-        async with MCPServerStreamableHttp(params=mcp_params, name="EduClient") as mcp_server_client:
-            logger.info(f"Connected to MCP server: {mcp_server_client.name}")
+        async with AsyncExitStack() as stack:
+            # Close the pooled LLM HTTP client after the MCP client shuts down
+            stack.push_async_callback(http_client.aclose)
+            mcp_server_client = await get_mcp_client(stack)
+            logger.info("Connected to MCP server: %s", mcp_server_client.name)
             
             # Uncomment to run agent
             await run_agent_with_mcp(mcp_server_client)
@@ -108,22 +137,22 @@ async def run_http_client():
             # await list_and_read_resources(mcp_server_client)
 
     except ConnectionRefusedError:
-        logger.error(f"Error: Connection refused. Ensure the MCP server is running at {SERVER_MCP_ENDPOINT_URL}")
+        logger.error("Error: Connection refused. Ensure the MCP server is running at %s", SERVER_MCP_ENDPOINT_URL)
         raise
     except Exception as e:
-        logger.error(f"An unexpected error occurred: {str(e)}", exc_info=True)
+        logger.error("An unexpected error occurred: %s", e, exc_info=True)
         raise
 
 
 def main():
     """Main entry point for the application."""
     try:
-        asyncio.run(run_http_client())
+        run(run_http_client())
         logger.info("Client completed successfully")
     except KeyboardInterrupt:
         logger.info("Client interrupted by user")
     except Exception as e:
-        logger.error(f"Fatal error: {str(e)}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         exit(1)
 
 
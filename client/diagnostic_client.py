@@ -1,163 +1,169 @@
 import asyncio
 import logging
+from contextlib import AsyncExitStack
 from agents import Agent, ModelSettings, Runner, set_tracing_disabled # type: ignore
-from agents.mcp import MCPServerStreamableHttp, MCPServerStreamableHttpParams, MCPServer # type: ignore
+from agents.mcp import MCPServer # type: ignore
+
+from _logging import setup
+from _shared import SERVER_MCP_ENDPOINT_URL, build_uri_variations, get_mcp_client, run, supported_handlers
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup()
 logger = logging.getLogger(__name__)
-
-# Suppress the specific cleanup error from openai.agents
-logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
-
-# Define the MCP server endpoint URL
-SERVER_MCP_ENDPOINT_URL = "http://localhost:8000/mcp/" 
     
 set_tracing_disabled(True)
 
+# Listing MCP methods exercised by the diagnostic, issued concurrently
+LIST_RPC_METHODS = ("tools/list", "resources/list", "resources/templates/list")
+
+# Attribute names under which list results expose their items
+RESULT_LIST_ATTRS = ("resources", "resourceTemplates", "resource_templates", "templates")
+
+# URI spellings tried when testing resource reads
+TEST_URIS = build_uri_variations("students://S123/profile")
+
+# Substrings used to group session methods in the inspection output
+METHOD_KEYWORDS = (
+    ("resource", "Resource-related"),
+    ("template", "Template-related"),
+    ("list", "List"),
+)
+
 async def diagnose_mcp_session():
     """Diagnose the MCP session to understand available methods and capabilities."""
-    logger.info(f"Starting MCP diagnostic client for {SERVER_MCP_ENDPOINT_URL}...")
+    logger.info("Starting MCP diagnostic client for %s...", SERVER_MCP_ENDPOINT_URL)
     
     try:
-        mcp_params = MCPServerStreamableHttpParams(url=SERVER_MCP_ENDPOINT_URL)
-        
-        async with MCPServerStreamableHttp(params=mcp_params, name="DiagnosticClient") as mcp_server_client:
-            logger.info(f"Connected to MCP server: {mcp_server_client.name}")
+        async with AsyncExitStack() as stack:
+            mcp_server_client = await get_mcp_client(stack)
+            logger.info("Connected to MCP server: %s", mcp_server_client.name)
             
-            # Diagnose the server client object
-            logger.info("\n=== MCP Server Client Inspection ===")
-            server_methods = [method for method in dir(mcp_server_client) if not method.startswith('_')]
-            logger.info("Available server client methods:")
-            for method in server_methods:
-                if callable(getattr(mcp_server_client, method)):
-                    logger.info(f"  - {method}")
+            # Diagnose the server client object (skipped entirely when INFO is filtered)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("\n=== MCP Server Client Inspection ===")
+                server_methods = [method for method in dir(mcp_server_client) if not method.startswith('_')]
+                logger.info("Available server client methods:")
+                for method in server_methods:
+                    if callable(getattr(mcp_server_client, method)):
+                        logger.info("  - %s", method)
             
             # Test session access
             logger.info("\n=== Session Inspection ===")
             try:
-                async with mcp_server_client.session as session:
-                    logger.info(f"Session type: {type(session)}")
-                    logger.info(f"Session: {session}")
-                    
-                    # List all available methods on the session
-                    session_methods = [method for method in dir(session) if not method.startswith('_')]
+                # connect() already entered the session, and other callers may share it
+                session = mcp_server_client.session
+                logger.info("Session type: %s", type(session))
+                logger.info("Session: %s", session)
+                
+                if logger.isEnabledFor(logging.INFO):
+                    # Resolve callable public names once and derive every filtered view from them
+                    session_methods = sorted(
+                        name for name in dir(session)
+                        if not name.startswith('_') and callable(getattr(session, name, None))
+                    )
                     logger.info("\nAll session methods:")
-                    for method in sorted(session_methods):
-                        if callable(getattr(session, method)):
-                            logger.info(f"  - {method}")
-                    
-                    # Focus on resource-related methods
-                    logger.info("\nResource-related methods:")
-                    resource_methods = [method for method in session_methods if 'resource' in method.lower()]
-                    for method in resource_methods:
-                        logger.info(f"  - {method}")
+                    for method in session_methods:
+                        logger.info("  - %s", method)
+                
+                    # Focus on resource-, template- and list-related methods
+                    for keyword, label in METHOD_KEYWORDS:
+                        logger.info("\n%s methods:", label)
+                        for method in session_methods:
+                            if keyword in method.lower():
+                                logger.info("  - %s", method)
+                
+                # connect() already ran the initialize handshake; its advertised
+                # capabilities decide which methods get called
+                capabilities = mcp_server_client.server_initialize_result.capabilities
+                handlers = supported_handlers(capabilities)
+                logger.info("Advertised capabilities: %s", capabilities)
+                
+                # Issue list_tools and the resource listings concurrently on the one session
+                calls = {}
+                for rpc_method in LIST_RPC_METHODS:
+                    method_name = handlers.get(rpc_method)
+                    method = getattr(session, method_name, None) if method_name else None
+                    if method is None or not callable(method):
+                        logger.info("  %s not advertised by server", rpc_method)
+                        continue
+                    calls[method_name] = method()
+                results = dict(zip(calls, await asyncio.gather(*calls.values(), return_exceptions=True)))
+                
+                # Test basic connectivity
+                logger.info("\n=== Testing Basic Session Methods ===")
+                
+                tools_result = results.pop("list_tools", None)
+                if isinstance(tools_result, BaseException):
+                    logger.error("✗ list_tools() failed: %s", tools_result)
+                elif tools_result is not None:
+                    logger.info("✓ list_tools() successful, type: %s", type(tools_result))
+                    if hasattr(tools_result, 'tools'):
+                        logger.info("  Tools count: %s", len(tools_result.tools))
+                    else:
+                        logger.info("  Direct tools list: %s", len(tools_result) if hasattr(tools_result, '__len__') else 'Unknown')
+                
+                # Test resource methods
+                logger.info("\n=== Testing Resource Methods ===")
+                
+                for method_name, result in results.items():
+                    if isinstance(result, BaseException):
+                        logger.error("✗ %s() failed: %s", method_name, result)
+                        continue
                     
-                    # Focus on template-related methods
-                    logger.info("\nTemplate-related methods:")
-                    template_methods = [method for method in session_methods if 'template' in method.lower()]
-                    for method in template_methods:
-                        logger.info(f"  - {method}")
+                    # Collect the whole inspection into one record and emit it once
+                    info = {"method": method_name, "type": str(type(result))}
                     
-                    # Focus on list methods
-                    logger.info("\nList methods:")
-                    list_methods = [method for method in session_methods if 'list' in method.lower()]
-                    for method in list_methods:
-                        logger.info(f"  - {method}")
+                    # Try to inspect the result structure
+                    if hasattr(result, '__dict__'):
+                        info["attrs"] = list(result.__dict__.keys())
+                    elif hasattr(result, '__len__'):
+                        info["length"] = len(result)
                     
-                    # Test basic connectivity
-                    logger.info("\n=== Testing Basic Session Methods ===")
+                    # Try common attribute names
+                    for attr in RESULT_LIST_ATTRS:
+                        attr_value = getattr(result, attr, None)
+                        if attr_value is not None:
+                            info[attr] = {
+                                "type": str(type(attr_value)),
+                                "length": len(attr_value) if hasattr(attr_value, '__len__') else 'N/A',
+                            }
                     
-                    # Test list_tools if available
-                    if hasattr(session, 'list_tools'):
+                    logger.info("✓ probe %s", info)
+                
+                # Test read_resource if we can find any resource URIs
+                logger.info("\n=== Testing Resource Reading ===")
+                read_resource = getattr(session, 'read_resource', None)
+                for uri in TEST_URIS:
+                    if read_resource is not None and callable(read_resource):
                         try:
-                            tools_result = await session.list_tools()
-                            logger.info(f"✓ list_tools() successful, type: {type(tools_result)}")
-                            if hasattr(tools_result, 'tools'):
-                                logger.info(f"  Tools count: {len(tools_result.tools)}")
-                            else:
-                                logger.info(f"  Direct tools list: {len(tools_result) if hasattr(tools_result, '__len__') else 'Unknown'}")
-                        except Exception as e:
-                            logger.error(f"✗ list_tools() failed: {e}")
-                    
-                    # Test resource methods
-                    logger.info("\n=== Testing Resource Methods ===")
-                    
-                    # Test each possible resource method
-                    resource_test_methods = [
-                        'list_resources',
-                        'list_resource_templates', 
-                        'list_resource_templates_mcp',
-                        'resources',
-                        'resource_templates'
-                    ]
-                    
-                    for method_name in resource_test_methods:
-                        if hasattr(session, method_name):
-                            try:
-                                method = getattr(session, method_name)
-                                if callable(method):
-                                    result = await method()
-                                    logger.info(f"✓ {method_name}() successful, type: {type(result)}")
-                                    
-                                    # Try to inspect the result structure
-                                    if hasattr(result, '__dict__'):
-                                        logger.info(f"  Result attributes: {list(result.__dict__.keys())}")
-                                    elif hasattr(result, '__len__'):
-                                        logger.info(f"  Result length: {len(result)}")
-                                    
-                                    # Try common attribute names
-                                    for attr in ['resources', 'resourceTemplates', 'resource_templates', 'templates']:
-                                        if hasattr(result, attr):
-                                            attr_value = getattr(result, attr)
-                                            logger.info(f"  Has {attr}: {type(attr_value)}, length: {len(attr_value) if hasattr(attr_value, '__len__') else 'N/A'}")
-                                else:
-                                    logger.info(f"  {method_name} is not callable")
-                            except Exception as e:
-                                logger.error(f"✗ {method_name}() failed: {e}")
-                        else:
-                            logger.info(f"  {method_name} not available")
-                    
-                    # Test read_resource if we can find any resource URIs
-                    logger.info("\n=== Testing Resource Reading ===")
-                    test_uris = [
-                        "students://S123/profile",
-                        "student://S123/profile", 
-                        "resource://students/S123/profile",
-                        "data://students/S123/profile"
-                    ]
-                    
-                    for uri in test_uris:
-                        if hasattr(session, 'read_resource'):
-                            try:
-                                result = await session.read_resource(uri)
-                                logger.info(f"✓ read_resource('{uri}') successful, type: {type(result)}")
-                                if hasattr(result, '__dict__'):
-                                    logger.info(f"  Result attributes: {list(result.__dict__.keys())}")
-                                break
-                            except Exception as e:
-                                logger.info(f"✗ read_resource('{uri}') failed: {e}")
-                        else:
-                            logger.info("  read_resource method not available")
+                            result = await read_resource(uri)
+                            logger.info("✓ read_resource('%s') successful, type: %s", uri, type(result))
+                            if hasattr(result, '__dict__'):
+                                logger.info("  Result attributes: %s", list(result.__dict__.keys()))
                             break
-                    
+                        except Exception as e:
+                            logger.info("✗ read_resource('%s') failed: %s", uri, e)
+                    else:
+                        logger.info("  read_resource method not available")
+                        break
+                
             except Exception as e:
-                logger.error(f"Error accessing session: {e}")
+                logger.error("Error accessing session: %s", e)
                 
     except ConnectionRefusedError:
-        logger.error(f"Error: Connection refused. Ensure the MCP server is running at {SERVER_MCP_ENDPOINT_URL}")
+        logger.error("Error: Connection refused. Ensure the MCP server is running at %s", SERVER_MCP_ENDPOINT_URL)
     except Exception as e:
-        logger.error(f"An unexpected error occurred: {str(e)}", exc_info=True)
+        logger.error("An unexpected error occurred: %s", e, exc_info=True)
 
 def main():
     """Main entry point for the diagnostic tool."""
     try:
-        asyncio.run(diagnose_mcp_session())
+        run(diagnose_mcp_session())
         logger.info("Diagnostic completed successfully")
     except KeyboardInterrupt:
         logger.info("Diagnostic interrupted by user")
     except Exception as e:
-        logger.error(f"Fatal error: {str(e)}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         exit(1)
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, ModelSettings, RunConfig # type: ignore
 from dotenv import load_dotenv
+import httpx
 import os
 
 load_dotenv()
@@ -12,9 +13,17 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 
+# One pooled HTTP client for every LLM call; close it with `await http_client.aclose()` on shutdown
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    http2=True,
+    timeout=httpx.Timeout(60.0),
+)
+
 external_client = AsyncOpenAI(
     api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    http_client=http_client,
 )
 
 model1 = OpenAIChatCompletionsModel(
@@ -1,13 +1,15 @@
-from Models.pydantic_models import Student, Enrollment, ClassSchedule, CourseCode, Weekday, CourseSection, CurrentTopic, Todo
+from Models.pydantic_models import Student, Enrollment, ClassSchedule, CourseCode, Weekday, CourseSection, CurrentTopic, Todo, COURSE_TITLES
+from Models.records import StudentRec, EnrollmentRec, CurrentTopicRec
+from dataclasses import asdict
 from datetime import datetime
 from uuid import uuid4
 
 
 
 
-# In-memory data store
-student_store = [
-    Student(
+# Seed data; trusted constants, so built with model_construct to skip validation
+_students = [
+    Student.model_construct(
         id="S123",
         name="Ayaan Qureshi",
         email="ayaan.qureshi@example.com",
@@ -16,35 +18,72 @@ student_store = [
     )
 ]
 
-enrollment_store = [
-    Enrollment(
+_enrollments = [
+    Enrollment.model_construct(
         id=uuid4(),
         course_code=CourseCode.AI_101,
         section=CourseSection.A,
+        course_name=COURSE_TITLES[CourseCode.AI_101],
         instructor="Sajid Khan",
         schedule=[
-            ClassSchedule(day=Weekday.MONDAY, time="10:00 AM - 11:30 AM"),
-            ClassSchedule(day=Weekday.WEDNESDAY, time="10:00 AM - 11:30 AM")
+            ClassSchedule.model_construct(day=Weekday.MONDAY, time="10:00 AM - 11:30 AM"),
+            ClassSchedule.model_construct(day=Weekday.WEDNESDAY, time="10:00 AM - 11:30 AM")
         ],
         last_class_date=datetime(2025, 6, 2, 10, 0),
         last_class_covered="Introduction to Python",
         todos=[
-            Todo(description="Complete assignment 1", due_date=datetime(2025, 6, 10)),
-            Todo(description="Read chapter 3", due_date=datetime(2025, 6, 10))
+            Todo.model_construct(description="Complete assignment 1", due_date=datetime(2025, 6, 10)),
+            Todo.model_construct(description="Read chapter 3", due_date=datetime(2025, 6, 10))
         ],
-        covered_topics=["Python Basics", "Introduction to Variables"],
+        covered_topics=("Python Basics", "Introduction to Variables"),
         next_class_time=datetime(2025, 6, 9, 10, 0)
     )
 ]
 
-topic_store = [
-    CurrentTopic(
+_topics = [
+    CurrentTopic.model_construct(
         course_code=CourseCode.AI_101,
         topic="Introduction to Lists",
         start_date=datetime(2025, 6, 2)
     )
 ]
 
+# In-memory data store of read-only records; the BaseModel instances are dropped after conversion
+student_store = [StudentRec.from_model(student) for student in _students]
+enrollment_store = [EnrollmentRec.from_model(enrollment) for enrollment in _enrollments]
+topic_store = [CurrentTopicRec.from_model(topic) for topic in _topics]
+del _students, _enrollments, _topics
+
+def _index_first(records, key):
+    """Index records by key, keeping the first record for each key like a linear scan would."""
+    index = {}
+    for record in records:
+        index.setdefault(key(record), record)
+    return index
+
+# Lookup indexes, built once at import
+student_by_id = _index_first(student_store, lambda student: student.id)
+enrollment_by_course_section = _index_first(
+    enrollment_store, lambda enrollment: (enrollment.course_code, enrollment.section)
+)
+enrollment_by_course = _index_first(enrollment_store, lambda enrollment: enrollment.course_code)
+topic_by_course = _index_first(topic_store, lambda topic: topic.course_code)
+
+# Serialized views of the read-only records, dumped once and shared across requests
+student_dump_by_id = {student_id: asdict(student) for student_id, student in student_by_id.items()}
+enrollment_dump_by_course = {
+    course_code: asdict(enrollment) for course_code, enrollment in enrollment_by_course.items()
+}
+schedule_dump_by_course_section = {
+    key: [asdict(session) for session in enrollment.schedule]
+    for key, enrollment in enrollment_by_course_section.items()
+}
+topic_dump_by_course = {course_code: asdict(topic) for course_code, topic in topic_by_course.items()}
+next_class_iso_by_course_section = {
+    key: enrollment.next_class_time.isoformat() if enrollment.next_class_time else None
+    for key, enrollment in enrollment_by_course_section.items()
+}
+
 
 
 
@@ -1,10 +1,13 @@
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, EmailStr, field_validator
 from enum import Enum
 from uuid import UUID, uuid4
 import re
 
+# Precompiled validation patterns
+_TIME_RE = re.compile(r"^\d{1,2}:\d{2} (AM|PM) - \d{1,2}:\d{2} (AM|PM)$")
+
 # Enums
 class CourseCode(str, Enum):
     AI_101 = "AI-101"
@@ -26,6 +29,14 @@ class CourseSection(str, Enum):
     B = "B"
     C = "C"
 
+# Course titles by course code
+COURSE_TITLES = {
+    CourseCode.AI_101: "Modern AI Python Programming",
+    CourseCode.AI_201: "Fundamentals of Agentic AI and DACA AI-First Development",
+    CourseCode.AI_202: "DACA Cloud-First Agentic AI Development",
+    CourseCode.AI_301: "DACA Planet-Scale Distributed AI Agents",
+}
+
 # Models
 class Todo(BaseModel):
     id: UUID = Field(default_factory=uuid4, description="Unique identifier for the todo")
@@ -46,8 +57,7 @@ class ClassSchedule(BaseModel):
     @field_validator("time")
     @classmethod
     def validate_time(cls, v: str) -> str:
-        pattern = r"^\d{1,2}:\d{2} (AM|PM) - \d{1,2}:\d{2} (AM|PM)$"
-        if not re.match(pattern, v):
+        if not _TIME_RE.match(v):
             raise ValueError("Time must be in format 'HH:MM AM/PM - HH:MM AM/PM'")
         return v
 
@@ -55,28 +65,15 @@ class Enrollment(BaseModel):
     id: UUID = Field(default_factory=uuid4, description="Unique enrollment ID")
     course_code: CourseCode = Field(..., description="Course code for enrollment")
     section: CourseSection = Field(..., description="Course section")
-    course_name: Optional[str] = Field(default=None, description="Auto-filled course name based on course code")
+    course_name: Optional[str] = Field(default=None, description="Course name; see COURSE_TITLES for the title of each course code")
     instructor: str = Field(..., description="Name of the course instructor")
     schedule: List[ClassSchedule] = Field(..., description="List of class schedules")
     last_class_date: Optional[datetime] = Field(None, description="Date of the last class attended")
     last_class_covered: str = Field(..., description="Last class topic covered")
     todos: List[Todo] = Field(default_factory=list, description="Pending tasks for the student")
-    covered_topics: List[str] = Field(default_factory=list, description="Topics covered so far in the course")
+    covered_topics: Tuple[str, ...] = Field(default_factory=tuple, description="Topics covered so far in the course")
     next_class_time: Optional[datetime] = Field(None, description="Date and time of the next class")
 
-    _course_titles = {
-        CourseCode.AI_101: "Modern AI Python Programming",
-        CourseCode.AI_201: "Fundamentals of Agentic AI and DACA AI-First Development",
-        CourseCode.AI_202: "DACA Cloud-First Agentic AI Development",
-        CourseCode.AI_301: "DACA Planet-Scale Distributed AI Agents",
-    }
-
-    @model_validator(mode="after")
-    def set_course_name(self) -> "Enrollment":
-        if not self.course_name:
-            self.course_name = self._course_titles.get(self.course_code)
-        return self
-
 class CurrentTopic(BaseModel):
     course_code: CourseCode = Field(..., description="Course code")
     topic: str = Field(..., min_length=1, description="Current topic being covered")
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from Models.pydantic_models import Student, Enrollment, ClassSchedule, CourseCode, Weekday, CourseSection, CurrentTopic, Todo, COURSE_TITLES
+
+# Read-only records for the in-memory stores.
+# Data enters through the pydantic models (validated at ingress), then is kept in these slotted
+# frozen dataclasses, which are much lighter per instance than BaseModel objects.
+
+@dataclass(slots=True, frozen=True)
+class TodoRec:
+    id: UUID
+    description: str
+    due_date: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, todo: Todo) -> "TodoRec":
+        return cls(id=todo.id, description=todo.description, due_date=todo.due_date)
+
+@dataclass(slots=True, frozen=True)
+class StudentRec:
+    id: str
+    name: str
+    email: str
+    phone: str
+    course_code: CourseCode
+
+    @classmethod
+    def from_model(cls, student: Student) -> "StudentRec":
+        return cls(
+            id=student.id,
+            name=student.name,
+            email=student.email,
+            phone=student.phone,
+            course_code=student.course_code,
+        )
+
+@dataclass(slots=True, frozen=True)
+class ClassScheduleRec:
+    day: Weekday
+    time: str
+
+    @classmethod
+    def from_model(cls, schedule: ClassSchedule) -> "ClassScheduleRec":
+        return cls(day=schedule.day, time=schedule.time)
+
+@dataclass(slots=True, frozen=True)
+class EnrollmentRec:
+    id: UUID
+    course_code: CourseCode
+    section: CourseSection
+    course_name: Optional[str]
+    instructor: str
+    schedule: Tuple[ClassScheduleRec, ...]
+    last_class_date: Optional[datetime]
+    last_class_covered: str
+    todos: Tuple[TodoRec, ...]
+    covered_topics: Tuple[str, ...]
+    next_class_time: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, enrollment: Enrollment) -> "EnrollmentRec":
+        return cls(
+            id=enrollment.id,
+            course_code=enrollment.course_code,
+            section=enrollment.section,
+            # One-shot fill for enrollments that arrive without a course name
+            course_name=enrollment.course_name or COURSE_TITLES.get(enrollment.course_code),
+            instructor=enrollment.instructor,
+            schedule=tuple(ClassScheduleRec.from_model(s) for s in enrollment.schedule),
+            last_class_date=enrollment.last_class_date,
+            last_class_covered=enrollment.last_class_covered,
+            todos=tuple(TodoRec.from_model(t) for t in enrollment.todos),
+            covered_topics=tuple(enrollment.covered_topics),  # no copy when already a tuple
+            next_class_time=enrollment.next_class_time,
+        )
+
+@dataclass(slots=True, frozen=True)
+class CurrentTopicRec:
+    course_code: CourseCode
+    topic: str
+    start_date: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, topic: CurrentTopic) -> "CurrentTopicRec":
+        return cls(course_code=topic.course_code, topic=topic.topic, start_date=topic.start_date)
@@ -1,11 +1,21 @@
 import asyncio
 import logging
+import os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+import pydantic_core
 from mcp.server.fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import Response
 
-from Data.dummy_data import student_store, enrollment_store, topic_store
-from Models.pydantic_models import Enrollment, Student, CourseCode, CourseSection, ClassSchedule
+from Data.dummy_data import (
+    student_by_id, enrollment_by_course, enrollment_by_course_section,
+    student_dump_by_id, enrollment_dump_by_course, schedule_dump_by_course_section, topic_dump_by_course,
+    next_class_iso_by_course_section,
+)
+from Models.pydantic_models import CourseCode, CourseSection
+from Models.records import StudentRec, EnrollmentRec
 
 # Constants
 ERROR_CODES = {
@@ -53,6 +63,10 @@ def create_success_response(data: Dict[str, Any]) -> ApiResponse:
         "error": None
     }
 
+def serialize_response(response: ApiResponse) -> str:
+    """Serialize a response exactly as FastMCP does for non-str results."""
+    return pydantic_core.to_json(response, fallback=str, indent=2).decode()
+
 # Initialize MCP server with proper configuration
 mcp = FastMCP(
     name="StudentContextMCP",
@@ -60,27 +74,131 @@ mcp = FastMCP(
     # Important for MCPServerStreamableHttp client in openai-agents-python
     # The client will handle sessions if needed, server can be stateless.
     stateless_http=True,
-    json_response=True, # Generally easier for HTTP clients if they don't need full SSE parsing
+    # Generally easier for HTTP clients if they don't need full SSE parsing;
+    # set MCP_JSON=0 to answer over the SSE stream instead
+    json_response=os.getenv("MCP_JSON", "1") == "1",
+    # No custom encoder: tool results go through pydantic_core.to_json and the JSON-RPC
+    # envelope through model_dump_json, both already serialized in Rust
 )
 
 
 # Helper functions for data access
-def find_student(student_id: str) -> Optional[Student]:
+def find_student(student_id: str) -> Optional[StudentRec]:
     """Find a student by their ID."""
-    try:
-        return next((student for student in student_store if student.id == student_id), None)
-    except Exception as e:
-        logger.error(f"Error finding student {student_id}: {str(e)}")
-        return None
+    return student_by_id.get(student_id)
 
 
-def find_enrollment(course_code: CourseCode) -> Optional[Enrollment]:
+def find_enrollment(course_code: CourseCode) -> Optional[EnrollmentRec]:
     """Find an enrollment by course code."""
-    try:
-        return next((enrollment for enrollment in enrollment_store if enrollment.course_code == course_code), None)
-    except Exception as e:
-        logger.error(f"Error finding enrollment for course {course_code}: {str(e)}")
-        return None
+    return enrollment_by_course.get(course_code)
+
+
+def find_section_enrollment(course_code: CourseCode, section: CourseSection) -> Optional[EnrollmentRec]:
+    """Find an enrollment by course code and section."""
+    return enrollment_by_course_section.get((course_code, section))
+
+
+# Precomputed success responses
+# The stores never change after import, so every successful result is serialized once here.
+# FastMCP passes str results through untouched, so a hit costs a single dict lookup.
+student_info_text: Dict[str, str] = {
+    student.id: serialize_response(create_success_response({
+        "student": student_dump_by_id[student.id],
+        "enrollment": enrollment_dump_by_course[student.course_code]
+    }))
+    for student in student_by_id.values()
+    if student.course_code in enrollment_dump_by_course
+}
+
+class_schedule_text: Dict[Tuple[CourseCode, CourseSection], str] = {
+    key: serialize_response(create_success_response({
+        "course_code": key[0],
+        "section": key[1],
+        "schedule": schedule
+    }))
+    for key, schedule in schedule_dump_by_course_section.items()
+}
+
+next_class_text: Dict[Tuple[CourseCode, CourseSection], str] = {
+    key: serialize_response(create_success_response({
+        "course_code": key[0],
+        "section": key[1],
+        "next_class_time": next_class_iso_by_course_section[key],
+        "instructor": enrollment.instructor
+    }))
+    for key, enrollment in enrollment_by_course_section.items()
+    if next_class_iso_by_course_section[key]
+}
+
+course_topic_text: Dict[CourseCode, str] = {
+    course_code: serialize_response(create_success_response(topic))
+    for course_code, topic in topic_dump_by_course.items()
+}
+# Encoded once more for the plain-HTTP profile route, which writes bytes straight to the socket
+student_info_bytes: Dict[str, bytes] = {
+    student_id: text.encode() for student_id, text in student_info_text.items()
+}
+covered_topics_text: Dict[str, str] = {
+    student.id: serialize_response(create_success_response({
+        "student_id": student.id,
+        "course_code": student.course_code,
+        "course_name": enrollment.course_name,
+        "instructor": enrollment.instructor,
+        "covered_topics": enrollment.covered_topics
+    }))
+    for student in student_by_id.values()
+    if (enrollment := enrollment_by_course.get(student.course_code)) is not None
+}
+
+# One response per student bundling what the per-course tools would otherwise return separately
+student_bundle_text: Dict[str, str] = {
+    student.id: serialize_response(create_success_response({
+        "student": student_dump_by_id[student.id],
+        "enrollment": enrollment,
+        "schedule": schedule_dump_by_course_section[(student.course_code, enrollment["section"])],
+        "topic": topic_dump_by_course.get(student.course_code)
+    }))
+    for student in student_by_id.values()
+    if (enrollment := enrollment_dump_by_course.get(student.course_code)) is not None
+}
+
+
+# Precomputed error responses
+# Error messages only depend on the course code/section enums, so every variant is built once
+STUDENT_NOT_FOUND_TEXT = serialize_response(
+    create_error_response("STUDENT_NOT_FOUND", ERROR_CODES["STUDENT_NOT_FOUND"])
+)
+NO_NEXT_CLASS_TEXT = serialize_response(
+    create_error_response("NO_NEXT_CLASS", ERROR_CODES["NO_NEXT_CLASS"])
+)
+INTERNAL_ERROR_TEXT = serialize_response(
+    create_error_response("INTERNAL_ERROR", ERROR_CODES["INTERNAL_ERROR"])
+)
+
+enrollment_not_found_text: Dict[CourseCode, str] = {
+    course_code: serialize_response(create_error_response(
+        "ENROLLMENT_NOT_FOUND",
+        f"{ERROR_CODES['ENROLLMENT_NOT_FOUND']} {course_code}"
+    ))
+    for course_code in CourseCode
+}
+
+schedule_not_found_text: Dict[Tuple[CourseCode, CourseSection], str] = {
+    (course_code, section): serialize_response(create_error_response(
+        "SCHEDULE_NOT_FOUND",
+        f"{ERROR_CODES['SCHEDULE_NOT_FOUND']} {course_code} section {section}"
+    ))
+    for course_code in CourseCode
+    for section in CourseSection
+}
+
+topic_not_found_text: Dict[CourseCode, str] = {
+    course_code: serialize_response(create_error_response(
+        "TOPIC_NOT_FOUND",
+        f"{ERROR_CODES['TOPIC_NOT_FOUND']} {course_code}"
+    ))
+    for course_code in CourseCode
+}
 
 
 # --- Resources ---
@@ -92,7 +210,7 @@ def find_enrollment(course_code: CourseCode) -> Optional[Enrollment]:
     description="Get detailed student profile including enrollment information",
     mime_type="application/json"
 )
-def get_student_info(student_id: str) -> ApiResponse:
+def get_student_info(student_id: str) -> str:
     """
     Get student profile and enrollment details.
     
@@ -100,27 +218,17 @@ def get_student_info(student_id: str) -> ApiResponse:
         student_id: Unique identifier for the student
         
     Returns:
-        Dict containing student and enrollment information or error details
+        JSON text with student and enrollment information or error details
     """
-    try:
-        student = find_student(student_id)
-        if not student:
-            return create_error_response("STUDENT_NOT_FOUND", ERROR_CODES["STUDENT_NOT_FOUND"])
-        
-        enrollment = find_enrollment(student.course_code)
-        if not enrollment:
-            return create_error_response(
-                "ENROLLMENT_NOT_FOUND", 
-                f"{ERROR_CODES['ENROLLMENT_NOT_FOUND']} {student.course_code}"
-            )
-        
-        return create_success_response({
-            "student": student.model_dump(),
-            "enrollment": enrollment.model_dump()
-        })
-    except Exception as e:
-        logger.error(f"Error in get_student_info: {str(e)}")
-        return create_error_response("INTERNAL_ERROR", ERROR_CODES["INTERNAL_ERROR"])
+    response = student_info_text.get(student_id)
+    if response is not None:
+        return response
+
+    student = find_student(student_id)
+    if not student:
+        return STUDENT_NOT_FOUND_TEXT
+    
+    return enrollment_not_found_text[student.course_code]
 
 
 # --- Tools ---
@@ -130,7 +238,7 @@ def get_student_info(student_id: str) -> ApiResponse:
     name="get_class_schedule",
     description="Retrieve the class schedule for a specific course and section"
 )
-def get_class_schedule(course_code: CourseCode, section: CourseSection) -> ApiResponse:
+async def get_class_schedule(course_code: CourseCode, section: CourseSection) -> str:
     """
     Retrieve the class schedule for a given course and section.
     
@@ -140,31 +248,13 @@ def get_class_schedule(course_code: CourseCode, section: CourseSection) -> ApiRe
         section: Section identifier
         
     Returns:
-        Dict containing schedule information or error details
+        JSON text with schedule information or error details
     """
-    try:
-        # Find matching enrollment
-        schedule_info = next(
-            (enrollment for enrollment in enrollment_store 
-             if enrollment.course_code == course_code and enrollment.section == section),
-            None
-        )
-        
-        if not schedule_info:
-            return create_error_response(
-                "SCHEDULE_NOT_FOUND",
-                f"{ERROR_CODES['SCHEDULE_NOT_FOUND']} {course_code} section {section}"
-            )
-        
-        return create_success_response({
-            "course_code": course_code,
-            "section": section,
-            "schedule": [session.model_dump() for session in schedule_info.schedule]
-        })
-            
-    except Exception as e:
-        logger.error(f"Error in get_class_schedule: {str(e)}")
-        return create_error_response("INTERNAL_ERROR", ERROR_CODES["INTERNAL_ERROR"])
+    response = class_schedule_text.get((course_code, section))
+    if response is not None:
+        return response
+
+    return schedule_not_found_text[(course_code, section)]
 
 
 ## --- Next Class Time ---
@@ -172,35 +262,19 @@ def get_class_schedule(course_code: CourseCode, section: CourseSection) -> ApiRe
     name="get_next_class",
     description="Retrieve the next scheduled class time for a specific course and section",
 )
-def get_next_class_time(course_code: CourseCode, section: CourseSection) -> ApiResponse:
+async def get_next_class_time(course_code: CourseCode, section: CourseSection) -> str:
     """Retrieve the next class time for a given course and section."""
-    try:
-        # Find matching enrollment
-        enrollment = next(
-            (e for e in enrollment_store 
-             if e.course_code == course_code and e.section == section),
-            None
-        )
+    response = next_class_text.get((course_code, section))
+    if response is not None:
+        return response
+
+    # Find matching enrollment
+    enrollment = find_section_enrollment(course_code, section)
+    
+    if not enrollment:
+        return schedule_not_found_text[(course_code, section)]
         
-        if not enrollment:
-            return create_error_response(
-                "SCHEDULE_NOT_FOUND",
-                f"{ERROR_CODES['SCHEDULE_NOT_FOUND']} {course_code} section {section}"
-            )
-            
-        if not enrollment.next_class_time:
-            return create_error_response("NO_NEXT_CLASS", ERROR_CODES["NO_NEXT_CLASS"])
-            
-        return create_success_response({
-            "course_code": course_code,
-            "section": section,
-            "next_class_time": enrollment.next_class_time.isoformat(),
-            "instructor": enrollment.instructor
-        })
-            
-    except Exception as e:
-        logger.error(f"Error in get_next_class_time: {str(e)}")
-        return create_error_response("INTERNAL_ERROR", ERROR_CODES["INTERNAL_ERROR"])
+    return NO_NEXT_CLASS_TEXT
 
 
 ## --- Course Current Topic ---
@@ -208,26 +282,13 @@ def get_next_class_time(course_code: CourseCode, section: CourseSection) -> ApiR
     name="get_course_topic",
     description="Retrieve the current topic being covered in a specific course",
 )
-def get_course_current_topic(course_code: CourseCode) -> ApiResponse:
+async def get_course_current_topic(course_code: CourseCode) -> str:
     """Retrieve the current topic for a given course."""
-    try:
-        # Find matching topic
-        topic = next(
-            (t for t in topic_store if t.course_code == course_code),
-            None
-        )
-        
-        if not topic:
-            return create_error_response(
-                "TOPIC_NOT_FOUND",
-                f"{ERROR_CODES['TOPIC_NOT_FOUND']} {course_code}"
-            )
-            
-        return create_success_response(topic.model_dump())
-            
-    except Exception as e:
-        logger.error(f"Error in get_course_current_topic: {str(e)}")
-        return create_error_response("INTERNAL_ERROR", ERROR_CODES["INTERNAL_ERROR"])
+    response = course_topic_text.get(course_code)
+    if response is not None:
+        return response
+
+    return topic_not_found_text[course_code]
 
 
 ## --- Student's Course Covered Topics ---
@@ -235,52 +296,102 @@ def get_course_current_topic(course_code: CourseCode) -> ApiResponse:
     name="get_covered_topics",
     description="Retrieve the list of topics covered so far in the student's enrolled course",
 )
-def get_course_covered_topics(student_id: str) -> ApiResponse:
+async def get_course_covered_topics(student_id: str) -> str:
     """Retrieve the covered topics for a student's enrolled course."""
-    try:
-        # Find student
-        student = find_student(student_id)
-        if not student:
-            return create_error_response("STUDENT_NOT_FOUND", ERROR_CODES["STUDENT_NOT_FOUND"])
-            
-        # Find enrollment using student's course code
-        enrollment = next(
-            (e for e in enrollment_store 
-             if e.course_code == student.course_code),
-            None
-        )
+    response = covered_topics_text.get(student_id)
+    if response is not None:
+        return response
+
+    # Find student
+    student = find_student(student_id)
+    if not student:
+        return STUDENT_NOT_FOUND_TEXT
         
-        if not enrollment:
-            return create_error_response(
-                "ENROLLMENT_NOT_FOUND",
-                f"{ERROR_CODES['ENROLLMENT_NOT_FOUND']} {student.course_code}"
-            )
-            
-        return create_success_response({
-            "student_id": student_id,
-            "course_code": student.course_code,
-            "course_name": enrollment.course_name,
-            "instructor": enrollment.instructor,
-            "covered_topics": enrollment.covered_topics
-        })
-            
-    except Exception as e:
-        logger.error(f"Error in get_course_covered_topics: {str(e)}")
-        return create_error_response("INTERNAL_ERROR", ERROR_CODES["INTERNAL_ERROR"])
+    return enrollment_not_found_text[student.course_code]
+
+
+## --- Student Bundle ---
+@mcp.tool(
+    name="get_student_bundle",
+    description="Retrieve a student's profile, enrollment, class schedule and current course topic in one call",
+)
+async def get_student_bundle(student_id: str) -> str:
+    """Retrieve everything about a student's enrollment in a single round trip."""
+    response = student_bundle_text.get(student_id)
+    if response is not None:
+        return response
+
+    student = find_student(student_id)
+    if not student:
+        return STUDENT_NOT_FOUND_TEXT
+
+    return enrollment_not_found_text[student.course_code]
 
 
 # # --- Main entry point to run the server ---
 
 streamable_http_app = mcp.streamable_http_app()
-logger.info(f"Starting {streamable_http_app}")
+_mcp_lifespan = streamable_http_app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _eager_tasks_lifespan(app):
+    """Install the eager task factory on the server loop before the MCP session manager starts."""
+    asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    async with _mcp_lifespan(app) as state:
+        yield state
+
+
+streamable_http_app.router.lifespan_context = _eager_tasks_lifespan
+
+
+async def student_profile_endpoint(request: Request) -> Response:
+    """Serve a student profile over plain HTTP GET, bypassing MCP resource dispatch."""
+    student_id = request.path_params["student_id"]
+    body = student_info_bytes.get(student_id)
+    if body is not None:
+        return Response(body, media_type="application/json")
+    return Response(get_student_info(student_id), status_code=404, media_type="application/json")
+
+
+# Cacheable profile reads skip JSON-RPC parsing, session handling and serialization entirely
+streamable_http_app.add_route("/students/{student_id}/profile", student_profile_endpoint, methods=["GET"])
+
+
+async def internal_error_handler(request: Request, exc: Exception) -> Response:
+    """Turn any exception that escapes to the edge into the standard INTERNAL_ERROR response."""
+    logger.error("Error serving %s: %s", request.url.path, exc)
+    return Response(INTERNAL_ERROR_TEXT, status_code=500, media_type="application/json")
+
+
+# Handlers carry no try/except of their own: FastMCP already reports tool and resource
+# failures as MCP errors, and anything that still escapes is caught once here
+streamable_http_app.add_exception_handler(Exception, internal_error_handler)
+
+logger.info("Starting %s", streamable_http_app)
 
 
 if __name__ == "__main__":
     try:
         port = 8000
-        logger.info(f"Starting server on port {port}")
+        logger.info("Starting server on port %s", port)
         import uvicorn
-        uvicorn.run("server:streamable_http_app", host="0.0.0.0", port=port, reload=True, log_level="info")
+        if os.getenv("DEV") == "1":
+            # Development: auto-reload on file changes
+            uvicorn.run("server:streamable_http_app", host="0.0.0.0", port=port, loop="auto", reload=True, log_level="info")
+        else:
+            # "auto" selects uvloop and httptools whenever they are installed (declared for non-Windows platforms);
+            # the server is stateless, so requests can be spread across worker processes
+            uvicorn.run(
+                "server:streamable_http_app",
+                host="0.0.0.0",
+                port=port,
+                loop="auto",
+                http="auto",
+                workers=int(os.getenv("WORKERS", 2)),
+                access_log=False,
+                log_level="warning",
+            )
     except Exception as e:
-        logger.error(f"Failed to start server: {str(e)}")
+        logger.error("Failed to start server: %s", e)
         raise
\ No newline at end of file